@@ -1,11 +1,17 @@
 import os
+import asyncio
+import inspect
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import httpx
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langgraph.prebuilt import create_react_agent
-from langchain_core.tools import tool
-import sympy as sp
+from langchain_core.tools import StructuredTool, tool
+import math_tools
 import re
+from functools import lru_cache
 from typing import Optional
 
 # Load environment variables
@@ -150,8 +156,85 @@ Remember: Use tools to CHECK student work, not to give answers. Focus on concept
 # MATH TOOLS
 # =============================================================================
 
-@tool
-def calculate(expression: str) -> str:
+# SymPy work is CPU-bound and holds the GIL, so the tools run it in worker
+# processes; one slow sp.solve then no longer stalls other requests
+_POOL_WORKERS = 2
+# Seconds a single tool call may spend in SymPy before it is abandoned
+_TOOL_TIMEOUT = 20.0
+
+def _new_pool():
+    return ProcessPoolExecutor(max_workers=_POOL_WORKERS, initializer=math_tools.warm)
+
+_POOL = _new_pool()
+
+def _terminate_workers(pool):
+    """Kill the worker processes of `pool`, including ones mid-task."""
+    # ProcessPoolExecutor has no public way to stop a running task, so this
+    # reaches into its private _processes map (pid -> Process). Killing the
+    # workers marks the pool broken, which fails its outstanding futures
+    # with BrokenProcessPool rather than cancelling them.
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+
+def _replace_pool(pool):
+    """Swap in a fresh pool and tear down `pool`, including busy workers."""
+    global _POOL
+    if _POOL is pool:
+        _POOL = _new_pool()
+    # Otherwise a runaway solve keeps holding a worker slot
+    _terminate_workers(pool)
+    # Queued calls are left to fail with BrokenProcessPool, which their
+    # callers retry on the new pool; cancelling them would abort those runs
+    pool.shutdown(wait=False)
+
+async def _run_in_pool(fn, *args):
+    """
+    Run `fn(*args)` in the SymPy pool with a timeout.
+
+    A call that exceeds _TOOL_TIMEOUT raises asyncio.TimeoutError and the
+    pool is replaced. If a worker died or another call's timeout tore the
+    pool down (BrokenProcessPool), the call is retried once on the new one.
+    """
+    for attempt in range(2):
+        pool = _POOL
+        try:
+            future = asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+            return await asyncio.wait_for(future, _TOOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            _replace_pool(pool)
+            raise
+        except BrokenProcessPool:
+            _replace_pool(pool)
+            if attempt:
+                raise
+
+async def warm_tools():
+    """
+    Start and warm every SymPy worker ahead of the first request.
+
+    Workers are otherwise spawned lazily, so the first tool call would pay
+    for process startup plus SymPy's cold solve/simplify paths.
+    """
+    await asyncio.gather(
+        *(_run_in_pool(math_tools.calculate, "1+1") for _ in range(_POOL_WORKERS))
+    )
+
+def _pooled_tool(name: str, func, coroutine):
+    """
+    Build a tool that runs `func` in the SymPy pool when awaited.
+
+    Synchronous invoke() calls `func` inline, so sync graph invocation
+    keeps working. The coroutine's docstring is the tool description.
+    """
+    return StructuredTool.from_function(
+        func=func,
+        coroutine=coroutine,
+        name=name,
+        # Dedent like @tool does, so the model sees the same tool prompt
+        description=inspect.cleandoc(coroutine.__doc__),
+    )
+
+async def _calculate(expression: str) -> str:
     """
     Safely evaluate a mathematical expression.
 
@@ -163,31 +246,11 @@ def calculate(expression: str) -> str:
     Supports: +, -, *, /, **, (), sqrt(), sin(), cos(), etc.
     """
     try:
-        # Safe evaluation with limited scope
-        allowed_names = {
-            'sqrt': sp.sqrt,
-            'sin': sp.sin,
-            'cos': sp.cos,
-            'tan': sp.tan,
-            'log': sp.log,
-            'exp': sp.exp,
-            'pi': sp.pi,
-            'e': sp.E,
-            'abs': abs,
-            'round': round,
-        }
-
-        # Parse as sympy for safer evaluation
-        result = sp.sympify(expression, locals=allowed_names)
-        # Evaluate to numeric if possible
-        numeric_result = sp.N(result)
-
-        return f"{expression} = {numeric_result}"
-    except Exception as e:
-        return f"Could not calculate '{expression}': {str(e)}"
+        return await _run_in_pool(math_tools.calculate, expression)
+    except asyncio.TimeoutError:
+        return f"Could not calculate '{expression}': took longer than {_TOOL_TIMEOUT:g}s"
 
-@tool
-def solve_equation(equation: str, variable: str = "x") -> str:
+async def _solve_equation(equation: str, variable: str = "x") -> str:
     """
     Solve an algebraic equation for a variable.
 
@@ -200,69 +263,24 @@ def solve_equation(equation: str, variable: str = "x") -> str:
     - "x + 3*y = 7, x - y = 1" (system of equations)
     """
     try:
-        # Handle multiple equations (systems)
-        if ',' in equation:
-            eqs = [eq.strip() for eq in equation.split(',')]
-            symbols = sp.symbols(variable)
-            if isinstance(symbols, tuple):
-                varsyms = symbols
-            else:
-                varsyms = (symbols,)
-
-            sympy_eqs = []
-            for eq in eqs:
-                if '=' in eq:
-                    left, right = eq.split('=')
-                    sympy_eqs.append(sp.Eq(sp.sympify(left.strip()), sp.sympify(right.strip())))
-                else:
-                    sympy_eqs.append(sp.Eq(sp.sympify(eq.strip()), 0))
-
-            solutions = sp.solve(sympy_eqs, varsyms)
-
-            if not solutions:
-                return "No solution found"
-
-            if len(varsyms) == 1:
-                return f"x = {solutions}"
-            else:
-                result = []
-                for i, sol in enumerate(solutions):
-                    result.append(f"{varsyms[i]} = {sol}")
-                return ", ".join(result)
-
-        # Single equation
-        if '=' in equation:
-            left, right = equation.split('=')
-            sympy_eq = sp.Eq(sp.sympify(left.strip()), sp.sympify(right.strip()))
-        else:
-            sympy_eq = sp.Eq(sp.sympify(equation), 0)
-
-        var = sp.symbols(variable)
-        solutions = sp.solve(sympy_eq, var)
-
-        if not solutions:
-            return "No solution found"
-        elif len(solutions) == 1:
-            return f"{variable} = {solutions[0]}"
-        else:
-            return f"{variable} = {solutions}"
-
-    except Exception as e:
-        return f"Could not solve equation: {str(e)}"
+        return await _run_in_pool(math_tools.solve, equation, variable)
+    except asyncio.TimeoutError:
+        return f"Could not solve equation: took longer than {_TOOL_TIMEOUT:g}s"
 
-@tool
-def simplify_expression(expression: str) -> str:
+async def _simplify_expression(expression: str) -> str:
     """
     Simplify a mathematical expression.
 
     Use to check if a student's simplified form is correct.
     """
     try:
-        expr = sp.sympify(expression)
-        simplified = sp.simplify(expr)
-        return f"{expression} simplifies to: {simplified}"
-    except Exception as e:
-        return f"Could not simplify: {str(e)}"
+        return await _run_in_pool(math_tools.simplify, expression)
+    except asyncio.TimeoutError:
+        return f"Could not simplify: took longer than {_TOOL_TIMEOUT:g}s"
+
+calculate = _pooled_tool("calculate", math_tools.calculate, _calculate)
+solve_equation = _pooled_tool("solve_equation", math_tools.solve, _solve_equation)
+simplify_expression = _pooled_tool("simplify_expression", math_tools.simplify, _simplify_expression)
 
 @tool
 def get_hint(topic: str) -> str:
@@ -287,6 +305,22 @@ def get_hint(topic: str) -> str:
 # AGENT SETUP
 # =============================================================================
 
+@lru_cache(maxsize=None)
+def _get_http_client():
+    # One pooled HTTP/2 client for all LLM calls, so requests reuse open
+    # connections instead of paying a TCP/TLS handshake each time
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+
+async def close_http_client():
+    """Close the shared LLM HTTP client, if one was created; call on shutdown."""
+    if _get_http_client.cache_info().currsize:
+        await _get_http_client().aclose()
+
+@lru_cache(maxsize=None)
 def get_agent():
     api_key = os.getenv("OPENAI_API_KEY")
     base_url = os.getenv("OPENAI_BASE_URL")
@@ -302,19 +336,21 @@ def get_agent():
 
     llm = ChatOpenAI(
         model="glm-4.5-air",  # Faster model for real-time tutoring
+        streaming=True,  # Emit tokens as they arrive for /agent/stream and the CLI
+        http_async_client=_get_http_client(),
         **llm_kwargs
     )
 
     # Math tools
     tools = [calculate, solve_equation, simplify_expression, get_hint]
 
-    # Create ReAct agent with the LLM
-    graph = create_react_agent(llm, tools=tools)
+    # Create ReAct agent with the LLM. Clients resend the conversation on
+    # every request, so no checkpointer is attached and no per-step state
+    # is serialized (LangGraph Studio supplies its own when it needs one)
+    graph = create_react_agent(llm, tools=tools, checkpointer=None)
 
     return graph
 
-# Base graph for LangGraph Studio
-compiled_graph = get_agent()
 
 # =============================================================================
 # WRAPPED CHAIN FOR WEB UI (injects Socratic prompt)
@@ -323,6 +359,13 @@ compiled_graph = get_agent()
 from langchain_core.runnables import RunnableLambda
 from langchain_core.messages import SystemMessage
 
+# Built once and reused so every request sends a byte-identical prefix,
+# which also lets OpenAI-compatible servers hit their prompt prefix cache.
+# The fixed id stops LangGraph from assigning one to the shared instance.
+SOCRATIC_SYSTEM_MESSAGE = SystemMessage(
+    content=SOCCRATIC_TUTOR_INSTRUCTIONS, id="socratic-system-prompt"
+)
+
 def _inject_socratic_prompt(state):
     """Inject the Socratic system prompt before user messages"""
     messages = state.get("messages", [])
@@ -335,10 +378,21 @@ def _inject_socratic_prompt(state):
             return state
 
     # Prepend the Socratic system prompt
-    return {"messages": [SystemMessage(content=SOCCRATIC_TUTOR_INSTRUCTIONS)] + messages}
+    return {"messages": [SOCRATIC_SYSTEM_MESSAGE, *messages]}
 
 # Create a wrapped chain that injects the system prompt
 # This is what the web UI server will use
-socratic_agent_chain = (
-    RunnableLambda(_inject_socratic_prompt) | compiled_graph
-)
+@lru_cache(maxsize=None)
+def get_socratic_agent_chain():
+    return RunnableLambda(_inject_socratic_prompt) | get_agent()
+
+def __getattr__(name):
+    # compiled_graph (the base graph for LangGraph Studio) and
+    # socratic_agent_chain are built on first access, once per process, so
+    # importers that never touch them (e.g. tool pool workers) skip the
+    # ChatOpenAI/create_react_agent construction
+    if name == "compiled_graph":
+        return get_agent()
+    if name == "socratic_agent_chain":
+        return get_socratic_agent_chain()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,12 +6,70 @@ Called from Kotlin via Chaquopy Python bridge.
 """
 
 from sympy import (
-    symbols, simplify, expand, factor, solve, Eq,
+    Basic, Integer, symbols, simplify, expand, factor, solve, Eq,
     sin, cos, tan, sqrt, log, exp, Abs, Integral, Derivative,
     sympify, SympifyError
 )
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 import json
+import re
+
+
+# Candidate unknowns, in the order they are preferred when solving
+_VAR_NAMES = 'xyzabcn'
+_SYMS = {name: symbols(name) for name in _VAR_NAMES}
+_ZERO = Integer(0)
+# Match a candidate only when it stands alone, so 'exp' or 'abs' don't count
+_VAR_RE = re.compile(r'(?<![A-Za-z_])([xyzabcn])(?![A-Za-z_])')
+# "lhs = rhs" or a bare "lhs" (meaning lhs = 0), with surrounding whitespace trimmed
+_EQ_RE = re.compile(r'^\s*(?P<lhs>[^=]+?)\s*(?:=\s*(?P<rhs>.+?))?\s*$', re.DOTALL)
+
+
+@lru_cache(maxsize=512)
+def _memo_sympify(expr: str):
+    return sympify(expr)
+
+
+def _cached_sympify(expr: str):
+    """
+    Parse an expression with SymPy, memoizing repeated inputs.
+
+    SymPy expressions (Basic) are immutable, so a cached result is shared
+    between calls. sympify can also return plain containers such as a
+    list or dict; those are mutable, so each caller gets a fresh parse.
+    Parse errors propagate and are not cached.
+    """
+    result = _memo_sympify(expr)
+    if isinstance(result, Basic):
+        return result
+    return sympify(expr)
+
+
+@lru_cache(maxsize=512)
+def _cached_numeric(expr: str) -> Optional[float]:
+    """
+    Evaluate an expression to a float, memoizing repeated inputs.
+
+    Returns None when the result has no float value (symbols, complex
+    numbers, containers), so the caller shows the symbolic form instead.
+    """
+    try:
+        return float(_cached_sympify(expr).evalf())
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _cached_solve(equation, var) -> Tuple:
+    """Solve a parsed equation, memoized on the (equation, symbol) pair."""
+    return tuple(solve(equation, var))
+
+
+@lru_cache(maxsize=256)
+def _cached_simplify(expr):
+    """Simplify a parsed expression, memoized on the expression itself."""
+    return simplify(expr)
 
 
 def calculate(expr: str) -> Dict[str, Any]:
@@ -25,34 +83,35 @@ def calculate(expr: str) -> Dict[str, Any]:
         Dict with success, result, and explanation
     """
     try:
-        result = sympify(expr)
+        result = _cached_sympify(expr.strip())
         # Evaluate to numeric if possible
-        try:
-            numeric_result = float(result.evalf())
+        numeric_result = _cached_numeric(expr.strip())
+        if numeric_result is not None:
             return {
                 "success": True,
                 "result": str(numeric_result),
                 "explanation": f"Calculated: {expr} = {numeric_result}"
             }
-        except:
-            return {
-                "success": True,
-                "result": str(result),
-                "explanation": f"Expression: {expr} = {result}"
-            }
+        return {
+            "success": True,
+            "result": str(result),
+            "explanation": f"Expression: {expr} = {result}"
+        }
     except SympifyError as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error parsing expression: {e}",
-            "error": str(e)
+            "explanation": f"Error parsing expression: {message}",
+            "error": message
         }
     except Exception as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error calculating: {e}",
-            "error": str(e)
+            "explanation": f"Error calculating: {message}",
+            "error": message
         }
 
 
@@ -67,29 +126,28 @@ def solve_equation(equation_str: str) -> Dict[str, Any]:
         Dict with success, solutions, and explanation
     """
     try:
-        # Parse equation
-        if '=' not in equation_str:
+        # Split into both sides in a single pass
+        match = _EQ_RE.match(equation_str)
+        if match is None:
+            raise SympifyError(equation_str)
+
+        left_str, right_str = match['lhs'], match['rhs']
+        if right_str is None:
             # Assume it's an expression set to 0
             equation_str = f"{equation_str} = 0"
 
-        left_str, right_str = equation_str.split('=', 1)
-
-        # Try to determine the variable (x, y, z, etc.)
-        for var_name in ['x', 'y', 'z', 'a', 'b', 'c', 'n']:
-            if var_name in left_str or var_name in right_str:
-                var = symbols(var_name)
-                break
-        else:
-            # Default to x
-            var = symbols('x')
+        # Try to determine the variable (x, y, z, etc.), defaulting to x
+        # One scan over the whole equation covers both sides
+        found = set(_VAR_RE.findall(equation_str))
+        var = next((_SYMS[name] for name in _VAR_NAMES if name in found), _SYMS['x'])
 
         # Parse both sides
-        left = sympify(left_str.strip())
-        right = sympify(right_str.strip())
+        left = _cached_sympify(left_str)
+        right = _ZERO if right_str is None else _cached_sympify(right_str)
 
         # Create equation and solve
         equation = Eq(left, right)
-        solutions = solve(equation, var)
+        solutions = _cached_solve(equation, var)
 
         # Format solutions
         if len(solutions) == 0:
@@ -107,18 +165,20 @@ def solve_equation(equation_str: str) -> Dict[str, Any]:
         }
 
     except SympifyError as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error parsing equation: {e}",
-            "error": str(e)
+            "explanation": f"Error parsing equation: {message}",
+            "error": message
         }
     except Exception as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error solving equation: {e}",
-            "error": str(e)
+            "explanation": f"Error solving equation: {message}",
+            "error": message
         }
 
 
@@ -133,8 +193,8 @@ def simplify_expression(expr: str) -> Dict[str, Any]:
         Dict with success, simplified result, and steps
     """
     try:
-        original = sympify(expr)
-        simplified = simplify(original)
+        original = _cached_sympify(expr.strip())
+        simplified = _cached_simplify(original)
 
         # Also provide expanded form for educational value
         expanded = expand(original)
@@ -155,18 +215,20 @@ def simplify_expression(expr: str) -> Dict[str, Any]:
         }
 
     except SympifyError as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error parsing expression: {e}",
-            "error": str(e)
+            "explanation": f"Error parsing expression: {message}",
+            "error": message
         }
     except Exception as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error simplifying: {e}",
-            "error": str(e)
+            "explanation": f"Error simplifying: {message}",
+            "error": message
         }
 
 
@@ -181,7 +243,7 @@ def expand_expression(expr: str) -> Dict[str, Any]:
         Dict with success and expanded result
     """
     try:
-        original = sympify(expr)
+        original = _cached_sympify(expr.strip())
         expanded = expand(original)
 
         return {
@@ -191,11 +253,12 @@ def expand_expression(expr: str) -> Dict[str, Any]:
         }
 
     except Exception as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error expanding: {e}",
-            "error": str(e)
+            "explanation": f"Error expanding: {message}",
+            "error": message
         }
 
 
@@ -210,7 +273,7 @@ def factor_expression(expr: str) -> Dict[str, Any]:
         Dict with success and factored result
     """
     try:
-        original = sympify(expr)
+        original = _cached_sympify(expr.strip())
         factored = factor(original)
 
         return {
@@ -220,11 +283,12 @@ def factor_expression(expr: str) -> Dict[str, Any]:
         }
 
     except Exception as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error factoring: {e}",
-            "error": str(e)
+            "explanation": f"Error factoring: {message}",
+            "error": message
         }
 
 
@@ -296,17 +360,18 @@ def verify_worked_example(problem: str, student_work: str) -> Dict[str, Any]:
     Returns:
         Dict with verification results
     """
-    lines = [line.strip() for line in student_work.split('\n') if line.strip()]
+    # Only the last non-blank line is checked, so take it without splitting the rest
+    last_line = student_work.rstrip().rpartition('\n')[2].strip()
     feedback = []
 
     try:
         # Check if final answer is correct
-        if lines:
-            last_line = lines[-1]
+        if last_line:
             # Try to verify the answer
-            if '=' in last_line:
+            _, sep, answer = last_line.rpartition('=')
+            if sep:
                 # Could be an answer like "x = 5"
-                result = calculate(last_line.split('=')[1].strip())
+                result = calculate(answer.strip())
                 if result['success']:
                     feedback.append("✓ Final answer found")
                 else:
@@ -320,11 +385,12 @@ def verify_worked_example(problem: str, student_work: str) -> Dict[str, Any]:
         }
 
     except Exception as e:
+        message = str(e)
         return {
             "success": False,
             "result": None,
-            "explanation": f"Error verifying: {e}",
-            "error": str(e)
+            "explanation": f"Error verifying: {message}",
+            "error": message
         }
 
 
@@ -1,5 +1,6 @@
-from agent import compiled_graph, SOCCRATIC_TUTOR_INSTRUCTIONS
-from langchain_core.messages import SystemMessage, HumanMessage
+import sys
+from agent import compiled_graph, SOCRATIC_SYSTEM_MESSAGE
+from langchain_core.messages import AIMessage, HumanMessage
 
 def main():
     if compiled_graph is None:
@@ -32,14 +33,29 @@ def main():
 
             # Prepend system message for every request to ensure Socratic behavior
             messages = [
-                SystemMessage(content=SOCCRATIC_TUTOR_INSTRUCTIONS),
+                SOCRATIC_SYSTEM_MESSAGE,
                 HumanMessage(content=user_input)
             ]
 
-            response = compiled_graph.invoke({"messages": messages})
-
-            if "messages" in response and len(response["messages"]) > 0:
-                print(f"\nMath Mentor: {response['messages'][-1].content}\n")
+            # Stream the reply token by token instead of waiting for the full response
+            print("\nMath Mentor: ", end="", flush=True)
+            step = None
+            for chunk, metadata in compiled_graph.stream(
+                {"messages": messages}, stream_mode="messages"
+            ):
+                # Skip tool output; only the model's own tokens are shown
+                if not (isinstance(chunk, AIMessage) and isinstance(chunk.content, str)):
+                    continue
+                if not chunk.content:
+                    continue
+                # Text the model wrote before a tool call gets its own paragraph
+                # instead of running into the next step's reply
+                if step is not None and metadata["langgraph_step"] != step:
+                    sys.stdout.write("\n\n")
+                step = metadata["langgraph_step"]
+                sys.stdout.write(chunk.content)
+                sys.stdout.flush()
+            print("\n")
 
         except KeyboardInterrupt:
             print("\n\nKeep practicing! You've got this! 💪")
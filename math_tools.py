@@ -0,0 +1,125 @@
+"""
+SymPy helpers behind the agent's math tools.
+
+These live in their own importable module because agent.py runs them in
+a process pool: workers started with spawn/forkserver re-import the
+functions by module name, which fails for agent.py when LangGraph loads
+it by file path.
+"""
+
+import sympy as sp
+from functools import lru_cache
+
+# Shared Symbol instances for the common single-letter unknowns
+_SYMS = {name: sp.Symbol(name) for name in "xyzabcn"}
+_ZERO = sp.Integer(0)
+
+def _lookup_symbols(variable: str):
+    """Return the cached Symbol for a common name, else build it with sp.symbols."""
+    return _SYMS.get(variable) or sp.symbols(variable)
+
+# Safe evaluation scope for calculate, built once rather than per call
+_ALLOWED_NAMES = {
+    'sqrt': sp.sqrt,
+    'sin': sp.sin,
+    'cos': sp.cos,
+    'tan': sp.tan,
+    'log': sp.log,
+    'exp': sp.exp,
+    'pi': sp.pi,
+    'e': sp.E,
+    'abs': abs,
+    'round': round,
+}
+
+def calculate(expression: str) -> str:
+    """Evaluate an expression with SymPy and describe the result."""
+    try:
+        # Parse as sympy for safer evaluation
+        result = sp.sympify(expression, locals=_ALLOWED_NAMES)
+        # Evaluate to numeric if possible; integers are already exact, so skip
+        # the mpmath round trip on the common whole-number arithmetic path
+        numeric_result = result if isinstance(result, sp.Integer) else sp.N(result)
+
+        return f"{expression} = {numeric_result}"
+    except Exception as e:
+        return f"Could not calculate '{expression}': {e}"
+
+@lru_cache(maxsize=256)
+def _solve_impl(equation: str, variable: str) -> str:
+    """Solve a normalized equation; cached so repeated checks skip sp.solve."""
+    try:
+        # Handle multiple equations (systems)
+        if ',' in equation:
+            eqs = [eq.strip() for eq in equation.split(',')]
+            symbols = _lookup_symbols(variable)
+            if isinstance(symbols, tuple):
+                varsyms = symbols
+            else:
+                varsyms = (symbols,)
+
+            sympy_eqs = []
+            for eq in eqs:
+                if '=' in eq:
+                    left, right = eq.split('=')
+                    sympy_eqs.append(sp.Eq(sp.sympify(left.strip()), sp.sympify(right.strip())))
+                else:
+                    sympy_eqs.append(sp.Eq(sp.sympify(eq.strip()), _ZERO))
+
+            solutions = sp.solve(sympy_eqs, varsyms)
+
+            if not solutions:
+                return "No solution found"
+
+            if len(varsyms) == 1:
+                return f"x = {solutions}"
+            else:
+                result = []
+                for i, sol in enumerate(solutions):
+                    result.append(f"{varsyms[i]} = {sol}")
+                return ", ".join(result)
+
+        # Single equation
+        if '=' in equation:
+            left, right = equation.split('=')
+            sympy_eq = sp.Eq(sp.sympify(left.strip()), sp.sympify(right.strip()))
+        else:
+            sympy_eq = sp.Eq(sp.sympify(equation), _ZERO)
+
+        var = _lookup_symbols(variable)
+        solutions = sp.solve(sympy_eq, var)
+
+        if not solutions:
+            return "No solution found"
+        elif len(solutions) == 1:
+            return f"{variable} = {solutions[0]}"
+        else:
+            return f"{variable} = {solutions}"
+
+    except Exception as e:
+        return f"Could not solve equation: {e}"
+
+@lru_cache(maxsize=256)
+def _simplify_impl(expr: sp.Basic) -> sp.Basic:
+    """Simplify a parsed expression; keyed on the expression, not its text."""
+    return sp.simplify(expr)
+
+def simplify(expression: str) -> str:
+    """Simplify an expression with SymPy and describe the result."""
+    try:
+        expr = sp.sympify(expression)
+        simplified = _simplify_impl(expr)
+        return f"{expression} simplifies to: {simplified}"
+    except Exception as e:
+        return f"Could not simplify: {e}"
+
+def solve(equation: str, variable: str = "x") -> str:
+    """Normalize and solve an equation, describing the solutions."""
+    # Normalize whitespace so trivially different requests share a cache entry
+    return _solve_impl(" ".join(equation.split()), variable.strip())
+
+def warm():
+    """Prime SymPy's lazy imports and the caches; used as a pool initializer."""
+    calculate("1+1")
+    solve("x + 1 = 0")
+    simplify("x + x")
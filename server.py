@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from langserve import add_routes
-from agent import socratic_agent_chain
+from agent import socratic_agent_chain, warm_tools, close_http_client
 import uvicorn
 import os
 from dotenv import load_dotenv
@@ -31,5 +31,24 @@ add_routes(
     path="/agent",
 )
 
+@app.on_event("startup")
+async def _warmup():
+    # Move SymPy's one-time startup cost off the first user's request
+    await warm_tools()
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    await close_http_client()
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8200)
+    # Several workers spread requests across cores (each has its own SymPy
+    # pool); "auto" picks uvloop/httptools, installed via uvicorn[standard]
+    workers = int(os.getenv("WEB_CONCURRENCY", max(2, (os.cpu_count() or 1) // 2)))
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8200,
+        loop="auto",
+        http="auto",
+        workers=workers,
+    )
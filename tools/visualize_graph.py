@@ -1,15 +1,49 @@
+import hashlib
 import os
 import sys
 from agent import compiled_graph
 
+# Renderings are cached per graph structure, so repeat runs skip the
+# mermaid.ink/graphviz round trip until the agent graph actually changes
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".graph_cache")
+
+def _read_cache(path):
+    """Return cached bytes, or None on a miss (including unreadable caches)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write_cache(path, data):
+    """Best-effort cache write; a read-only checkout just means no caching."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    except OSError:
+        pass
+
 def generate_visualization():
     if compiled_graph is None:
         print("Could not load agent.")
         return
 
+    graph = compiled_graph.get_graph()
+    mermaid = graph.draw_mermaid()
+    key = hashlib.sha256(mermaid.encode()).hexdigest()[:12]
+    ascii_cache = os.path.join(CACHE_DIR, f"{key}.ascii")
+    png_cache = os.path.join(CACHE_DIR, f"{key}.png")
+
     print("Generating ASCII representation...")
     try:
-        print(compiled_graph.get_graph().draw_ascii())
+        cached = _read_cache(ascii_cache)
+        if cached is not None:
+            ascii_art = cached.decode("utf-8")
+        else:
+            ascii_art = graph.draw_ascii()
+            _write_cache(ascii_cache, ascii_art.encode("utf-8"))
+        print(ascii_art)
     except Exception as e:
         print(f"Error drawing ascii: {e}")
 
@@ -17,7 +51,10 @@ def generate_visualization():
     # We will try it but catch errors.
     print("\nAttempting to generate Mermaid PNG...")
     try:
-        png_data = compiled_graph.get_graph().draw_mermaid_png()
+        png_data = _read_cache(png_cache)
+        if png_data is None:
+            png_data = graph.draw_mermaid_png()
+            _write_cache(png_cache, png_data)
         output_file = "agent_graph.png"
         with open(output_file, "wb") as f:
             f.write(png_data)
@@ -26,7 +63,7 @@ def generate_visualization():
         print(f"Could not generate PNG (likely missing system dependencies or mermaid API access): {e}")
         print("You can copy the mermaid code below and paste it into https://mermaid.live/")
         print("-" * 20)
-        print(compiled_graph.get_graph().draw_mermaid())
+        print(mermaid)
         print("-" * 20)
 
 if __name__ == "__main__":